@@ -19,6 +19,8 @@ from pymc.distributions.logprob import (  # isort:skip
     logcdfpt,
     logp_transform,
     logpt,
+    logpt_compiled,
+    logpt_specialized,
     logpt_sum,
 )
 
@@ -192,6 +194,8 @@ __all__ = [
     "CAR",
     "PolyaGamma",
     "logpt",
+    "logpt_compiled",
+    "logpt_specialized",
     "logp",
     "logp_transform",
     "logcdf",
@@ -12,18 +12,24 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 import warnings
+import weakref
 
+from collections import ChainMap
 from collections.abc import Mapping
-from functools import singledispatch
-from typing import Dict, Optional, Union
+from functools import singledispatch, update_wrapper
+from typing import Dict, Optional, Sequence, Union
 
+import aesara
 import aesara.tensor as at
 import numpy as np
 
 from aeppl import factorized_joint_logprob
 from aeppl.transforms import TransformValuesOpt
 from aesara import config
-from aesara.graph.basic import graph_inputs, io_toposort
+from aesara.compile.function.types import Function
+from aesara.compile.mode import Mode
+from aesara.graph import optimize_graph
+from aesara.graph.basic import Variable, clone_replace, io_toposort
 from aesara.graph.op import Op, compute_test_value
 from aesara.tensor.random.op import RandomVariable
 from aesara.tensor.subtensor import (
@@ -35,15 +41,61 @@ from aesara.tensor.subtensor import (
     Subtensor,
 )
 from aesara.tensor.var import TensorVariable
+from cachetools import LRUCache
 
-from pymc.aesaraf import extract_rv_and_value_vars, floatX, rvs_to_value_vars
+from pymc.aesaraf import extract_rv_and_value_vars, floatX, inputvars, rvs_to_value_vars
 
 
-@singledispatch
+def _singledispatch_exact(func):
+    """Like `functools.singledispatch`, but with a plain ``dict`` lookup for the exact type.
+
+    `singledispatch` goes through its ABC-aware dispatch cache on every call,
+    which is comparatively slow for the hot calls below, where the dispatched
+    type is nearly always one that was registered directly.  Other types
+    still fall back to the regular MRO-based dispatch.
+    """
+    dispatcher = singledispatch(func)
+    # A live, read-only view of the registered implementations
+    registry = dispatcher.registry
+
+    def wrapper(*args, **kwargs):
+        impl = registry.get(args[0].__class__)
+        if impl is None:
+            impl = dispatcher.dispatch(args[0].__class__)
+        return impl(*args, **kwargs)
+
+    wrapper.register = dispatcher.register
+    wrapper.dispatch = dispatcher.dispatch
+    wrapper.registry = registry
+    wrapper._clear_cache = dispatcher._clear_cache
+    update_wrapper(wrapper, func)
+    return wrapper
+
+
+@_singledispatch_exact
 def logp_transform(op: Op):
     return None
 
 
+# The constant scaling of 1, for each floatX dtype
+_scaling_ones: Dict[str, TensorVariable] = {}
+
+
+def _get_scaling_one():
+    """Get the constant scaling of 1, which is shared by all the unscaled logp terms."""
+    one = _scaling_ones.get(config.floatX)
+    if one is None:
+        one = at.as_tensor(floatX(1))
+        one.tag.is_scaling_one = True
+        _scaling_ones[config.floatX] = one
+    return one
+
+
+def _is_scaling_one(coef):
+    """Check if a scaling returned by `_get_scaling` is the constant scaling of 1."""
+    return getattr(coef.tag, "is_scaling_one", False)
+
+
 def _get_scaling(total_size, shape, ndim):
     """
     Gets scaling constant for logp
@@ -61,7 +113,7 @@ def _get_scaling(total_size, shape, ndim):
     scalar
     """
     if total_size is None:
-        coef = floatX(1)
+        return _get_scaling_one()
     elif isinstance(total_size, int):
         if ndim >= 1:
             denom = shape[0]
@@ -91,23 +143,56 @@ def _get_scaling(total_size, shape, ndim):
                 "number of scalings is bigger that ndim, got %r" % total_size
             )
         elif (len(begin) + len(end)) == 0:
-            return floatX(1)
-        if len(end) > 0:
-            shp_end = shape[-len(end) :]
+            return _get_scaling_one()
+        sizes = [t for t in begin if t is not None] + [t for t in end if t is not None]
+        shapes = [shape[i] for i, t in enumerate(begin) if t is not None] + [
+            shape[i - len(end)] for i, t in enumerate(end) if t is not None
+        ]
+        if not sizes:
+            return _get_scaling_one()
+        elif len(sizes) == 1:
+            coef = floatX(sizes[0]) / shapes[0]
         else:
-            shp_end = np.asarray([])
-        shp_begin = shape[: len(begin)]
-        begin_coef = [floatX(t) / shp_begin[i] for i, t in enumerate(begin) if t is not None]
-        end_coef = [floatX(t) / shp_end[i] for i, t in enumerate(end) if t is not None]
-        coefs = begin_coef + end_coef
-        coef = at.prod(coefs)
+            # Divide all the scaled dimensions at once instead of one by one
+            coef = at.prod(at.as_tensor(floatX(np.asarray(sizes))) / at.stack(shapes))
     else:
         raise TypeError(
             "Unrecognized `total_size` type, expected int or list of ints, got %r" % total_size
         )
+    if isinstance(coef, TensorVariable):
+        return coef.astype(config.floatX)
     return at.as_tensor(floatX(coef))
 
 
+# Scaling graphs built by `_get_value_scaling`.  The value variables in the keys and
+# the graphs are only weakly referenced, so an entry lives as long as its graph is
+# used in a logp graph, and a key can't match a later variable that reuses an id.
+_scaling_cache = weakref.WeakValueDictionary()
+
+
+def _get_value_scaling(total_size, value):
+    """Get the scaling constant for the logp of `value`, see `_get_scaling`.
+
+    The same graph is returned for the same value variable and `total_size`,
+    so that the scalings of several logp terms can be merged by Aesara.
+    """
+    if total_size is None:
+        return _get_scaling(None, None, value.ndim)
+
+    key = (
+        weakref.ref(value),
+        tuple(total_size) if isinstance(total_size, list) else total_size,
+        value.ndim,
+        # The scaling is cast to floatX
+        config.floatX,
+    )
+    coef = _scaling_cache.get(key)
+    if coef is None:
+        coef = _get_scaling(total_size, value.shape, value.ndim)
+        _scaling_cache[key] = coef
+    return coef
+
+
 subtensor_types = (
     AdvancedIncSubtensor,
     AdvancedIncSubtensor1,
@@ -118,6 +203,151 @@ subtensor_types = (
 )
 
 
+# Graphs built by `logpt` and `logcdfpt`, keyed by weak references to the variables
+# they were built from.  The graphs are only weakly referenced as well, so an entry
+# lives as long as its graph is used elsewhere (e.g. in the logp graph of a model)
+# and the cache never keeps any model alive.
+_graph_cache = weakref.WeakValueDictionary()
+
+
+def _ref(obj):
+    """Return a weak reference to `obj` for the cache keys, or None if `obj` is None.
+
+    Unlike ids, dead references are only equal to themselves, so a key can't
+    match the variables of a later graph that happen to reuse the same ids.
+    """
+    if obj is None:
+        return None
+    return weakref.ref(obj)
+
+
+def _walk_ancestors(outs):
+    """Yield `outs` and all their ancestor variables, each once and after its inputs.
+
+    The variables are yielded in a topological order, like the nodes of
+    `io_toposort`, but without computing the inputs of the graph beforehand.
+    """
+    seen = set()
+    # Each variable is pushed once more after its inputs, to be yielded after them
+    stack = [(out, False) for out in reversed(outs)]
+    while stack:
+        var, inputs_done = stack.pop()
+        if inputs_done:
+            yield var
+            continue
+        if id(var) in seen:
+            continue
+        seen.add(id(var))
+        stack.append((var, True))
+        if var.owner:
+            stack.extend((inp, False) for inp in reversed(var.owner.inputs))
+
+
+def _get_tagged_value_var(var):
+    """Return the observations or, failing that, the value variable tagged on `var`."""
+    tag = var.tag
+    try:
+        return tag.observations
+    except AttributeError:
+        return getattr(tag, "value_var", None)
+
+
+def _as_value_of(var, value):
+    """Convert `value` to a tensor of the type of `var`, unless it already is one."""
+    if isinstance(value, TensorVariable) and value.type == var.type:
+        return value
+    return at.as_tensor_variable(value).astype(var.type)
+
+
+def _tag_fingerprint(var):
+    """Return a hashable summary of the tag attributes `logpt` reads from `var`."""
+    tag = var.tag
+    total_size = getattr(tag, "total_size", None)
+    if isinstance(total_size, list):
+        total_size = tuple(total_size)
+    return (
+        _ref(var),
+        _ref(getattr(tag, "observations", None)),
+        _ref(getattr(tag, "value_var", None)),
+        total_size,
+    )
+
+
+def _tagged_ancestors_fingerprint(vars_):
+    """Return a hashable summary of the value variables tagged on the ancestors of `vars_`.
+
+    The logp graph of a variable depends on the value variables (and their
+    transforms) of all its ancestors, which can be tagged after a graph was built.
+    """
+    fingerprint = []
+    for anc in _walk_ancestors(vars_):
+        value_var = _get_tagged_value_var(anc)
+        if value_var is not None:
+            fingerprint.append(
+                (_ref(anc), _ref(value_var), _ref(getattr(value_var.tag, "transform", None)))
+            )
+    return tuple(fingerprint)
+
+
+def _graph_cache_key(builder, var, rv_values, **kwargs):
+    """Compute the cache key for a call to `builder`.
+
+    Returns None when the arguments can't be fingerprinted (e.g. non-symbolic values).
+    """
+    vars_ = var if isinstance(var, list) else [var]
+    if not all(isinstance(v, Variable) for v in vars_):
+        return None
+
+    if rv_values is None:
+        values_key = None
+    elif isinstance(rv_values, Mapping):
+        items = list(rv_values.items())
+        if not all(isinstance(v, Variable) for item in items for v in item):
+            return None
+        values_key = frozenset(
+            (_ref(k), _ref(v), _ref(getattr(v.tag, "transform", None))) for k, v in items
+        )
+    elif isinstance(rv_values, Variable):
+        values_key = (_ref(rv_values), _ref(getattr(rv_values.tag, "transform", None)))
+    else:
+        return None
+
+    key = (
+        builder,
+        isinstance(var, list),
+        tuple(_tag_fingerprint(v) for v in vars_),
+        _tagged_ancestors_fingerprint(vars_),
+        values_key,
+        tuple(sorted(kwargs.items())),
+        # The graphs are built with floatX scalings
+        config.floatX,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _cached_graph(builder, var, rv_values, **kwargs):
+    """Return ``builder(var, rv_values, **kwargs)``, reusing a previously built graph."""
+    # The test values of a graph depend on those of its inputs, which can change
+    # between calls, so graphs built with test values are never reused.
+    if config.compute_test_value != "off":
+        return builder(var, rv_values, **kwargs)
+
+    key = _graph_cache_key(builder, var, rv_values, **kwargs)
+    if key is None:
+        return builder(var, rv_values, **kwargs)
+
+    graph = _graph_cache.get(key)
+    if graph is None:
+        graph = builder(var, rv_values, **kwargs)
+        if graph is not None:
+            _graph_cache[key] = graph
+    return graph
+
+
 def logpt(
     var: TensorVariable,
     rv_values: Optional[Union[TensorVariable, Dict[TensorVariable, TensorVariable]]] = None,
@@ -136,6 +366,12 @@ def logpt(
     the output of a ``NormalRV`` ``Op``, then the output is a graph of the
     density function for `var` set to the value `rv_value`.
 
+    The graphs are cached: as long as a graph is still in use, calling
+    `logpt` again with the same variables, values, tags and options returns
+    that same graph object.  Don't modify it in place (e.g. rename it), and
+    note that warnings raised while building it are only emitted once.
+    Graphs aren't cached while ``aesara.config.compute_test_value`` is on.
+
     Parameters
     ==========
     var
@@ -157,6 +393,28 @@ def logpt(
         Sum the log-likelihood.
 
     """
+    return _cached_graph(
+        _build_logpt,
+        var,
+        rv_values,
+        jacobian=jacobian,
+        scaling=scaling,
+        transformed=transformed,
+        sum=sum,
+        **kwargs,
+    )
+
+
+def _build_logpt(
+    var,
+    rv_values,
+    *,
+    jacobian: bool,
+    scaling: bool,
+    transformed: bool,
+    sum: bool,
+    **kwargs,
+):
     # TODO: In future when we drop support for tag.value_var most of the following
     # logic can be removed and logpt can just be a wrapper function that calls aeppl's
     # joint_logprob directly.
@@ -165,6 +423,9 @@ def logpt(
     if not isinstance(var, list):
         var = [var]
 
+    # The tagged value variables of the requested vars are needed in several places below
+    tagged_value_vars = {_var: _get_tagged_value_var(_var) for _var in var}
+
     # If logpt isn't provided values and the variable (provided in var)
     # is an RV, it is assumed that the tagged value var or observation is
     # the value variable for that particular RV.
@@ -172,15 +433,11 @@ def logpt(
         rv_values = {}
         for _var in var:
             if isinstance(_var.owner.op, RandomVariable):
-                rv_value_var = getattr(
-                    _var.tag, "observations", getattr(_var.tag, "value_var", _var)
-                )
-                rv_values = {_var: rv_value_var}
+                rv_value_var = tagged_value_vars[_var]
+                rv_values = {_var: _var if rv_value_var is None else rv_value_var}
     elif not isinstance(rv_values, Mapping):
         # Else if we're given a single value and a single variable we assume a mapping among them.
-        rv_values = (
-            {var[0]: at.as_tensor_variable(rv_values).astype(var[0].type)} if len(var) == 1 else {}
-        )
+        rv_values = {var[0]: _as_value_of(var[0], rv_values)} if len(var) == 1 else {}
 
     # Since the filtering of logp graph is based on value variables
     # provided to this function
@@ -188,45 +445,59 @@ def logpt(
         warnings.warn("No value variables provided the logp will be an empty graph")
 
     if scaling:
+        # Variables without a total_size are not scaled, so they don't need an entry
         rv_scalings = {}
         for _var in var:
-            rv_value_var = getattr(_var.tag, "observations", getattr(_var.tag, "value_var", _var))
-            rv_scalings[rv_value_var] = _get_scaling(
-                getattr(_var.tag, "total_size", None), rv_value_var.shape, rv_value_var.ndim
-            )
+            total_size = getattr(_var.tag, "total_size", None)
+            if total_size is None:
+                continue
+            rv_value_var = tagged_value_vars[_var]
+            if rv_value_var is None:
+                rv_value_var = _var
+            rv_scalings[rv_value_var] = _get_value_scaling(total_size, rv_value_var)
 
     # Aeppl needs all rv-values pairs, not just that of the requested var.
     # Hence we iterate through the graph to collect them.
-    tmp_rvs_to_values = rv_values.copy()
+    # Only the extra pairs are stored, the requested ones are read through from `rv_values`
+    tmp_rvs_to_values = ChainMap({}, rv_values)
     transform_map = {}
-    for node in io_toposort(graph_inputs(var), var):
-        try:
-            curr_vars = [node.default_output()]
-        except ValueError:
-            curr_vars = node.outputs
-        for curr_var in curr_vars:
-            rv_value_var = getattr(
-                curr_var.tag, "observations", getattr(curr_var.tag, "value_var", None)
-            )
-            if rv_value_var is None:
-                continue
-            rv_value = rv_values.get(curr_var, rv_value_var)
-            tmp_rvs_to_values[curr_var] = rv_value
-            # Along with value variables we also check for transforms if any.
-            if hasattr(rv_value_var.tag, "transform") and transformed:
-                transform_map[rv_value] = rv_value_var.tag.transform
+    for curr_var in _walk_ancestors(var):
+        if curr_var in tagged_value_vars:
+            rv_value_var = tagged_value_vars[curr_var]
+        else:
+            rv_value_var = _get_tagged_value_var(curr_var)
+        if rv_value_var is None:
+            continue
+        if curr_var in rv_values:
+            rv_value = rv_values[curr_var]
+        else:
+            rv_value = tmp_rvs_to_values[curr_var] = rv_value_var
+        # Along with value variables we also check for transforms if any.
+        if transformed and hasattr(rv_value_var.tag, "transform"):
+            transform_map[rv_value] = rv_value_var.tag.transform
 
-    transform_opt = TransformValuesOpt(transform_map)
+    # There is no need to run the transform rewrite if there is nothing to transform
+    transform_opt = TransformValuesOpt(transform_map) if transform_map else None
     temp_logp_var_dict = factorized_joint_logprob(
         tmp_rvs_to_values, extra_rewrites=transform_opt, use_jacobian=jacobian, **kwargs
     )
 
     # aeppl returns the logpt for every single value term we provided to it. This includes
     # the extra values we plugged in above so we need to filter those out.
-    logp_var_dict = {}
-    for value_var, _logp in temp_logp_var_dict.items():
-        if value_var in rv_values.values():
-            logp_var_dict[value_var] = _logp
+    if len(rv_values) == 1:
+        # The common single-variable call only needs a single lookup
+        (value_var,) = rv_values.values()
+        if value_var in temp_logp_var_dict:
+            logp_var_dict = {value_var: temp_logp_var_dict[value_var]}
+        else:
+            logp_var_dict = {}
+    else:
+        requested_value_ids = {id(value_var) for value_var in rv_values.values()}
+        logp_var_dict = {
+            value_var: _logp
+            for value_var, _logp in temp_logp_var_dict.items()
+            if id(value_var) in requested_value_ids
+        }
 
     # If it's an empty dictionary the logp is None
     if not logp_var_dict:
@@ -236,7 +507,7 @@ def logpt(
         # graphs accordingly.
         if scaling:
             for _value in logp_var_dict.keys():
-                if _value in rv_scalings:
+                if _value in rv_scalings and not _is_scaling_one(rv_scalings[_value]):
                     logp_var_dict[_value] *= rv_scalings[_value]
 
         if len(logp_var_dict) == 1:
@@ -247,19 +518,28 @@ def logpt(
                 logp_var = logp_var_dict
         else:
             if sum:
-                logp_var = at.sum([at.sum(factor) for factor in logp_var_dict.values()])
+                # Each factor is reduced to a scalar, so adding them up is enough
+                logp_var = at.add(*(at.sum(factor) for factor in logp_var_dict.values()))
             else:
                 logp_var = at.add(*logp_var_dict.values())
 
         # Recompute test values for the changes introduced by the replacements
         # above.
-        if config.compute_test_value != "off":
-            for node in io_toposort(graph_inputs((logp_var,)), (logp_var,)):
-                compute_test_value(node)
+        _recompute_test_values(logp_var)
 
     return logp_var
 
 
+def _recompute_test_values(var):
+    """Recompute the test values of the graph of `var` when test values are enabled."""
+    if config.compute_test_value == "off" or var.owner is None:
+        return
+    # `io_toposort` stops at the variables without an owner by itself, so there is
+    # no need to walk the graph once more beforehand to collect its inputs.
+    for node in io_toposort([], [var]):
+        compute_test_value(node)
+
+
 def logcdfpt(
     var: TensorVariable,
     rv_values: Optional[Union[TensorVariable, Dict[TensorVariable, TensorVariable]]] = None,
@@ -270,6 +550,8 @@ def logcdfpt(
 ) -> TensorVariable:
     """Create a measure-space (i.e. log-cdf) graph for a random variable at a given point.
 
+    The graphs are cached like those of `logpt`.
+
     Parameters
     ==========
     var
@@ -288,6 +570,10 @@ def logcdfpt(
         Sum the log-likelihood.
 
     """
+    return _cached_graph(_build_logcdfpt, var, rv_values, scaling=scaling, sum=sum, **kwargs)
+
+
+def _build_logcdfpt(var, rv_values, *, scaling: bool, sum: bool, **kwargs):
     if not isinstance(rv_values, Mapping):
         rv_values = {var: rv_values} if rv_values is not None else {}
 
@@ -319,16 +605,14 @@ def logcdfpt(
     # Ultimately, with a graph containing only random variables and
     # "deterministics", we can simply replace all the random variables with
     # their value variables and be done.
-    tmp_rv_values = rv_values.copy()
-    tmp_rv_values[rv_var] = rv_var
+    tmp_rv_values = ChainMap({rv_var: rv_var}, rv_values)
 
     logp_var = _logcdf(rv_node.op, rv_var, tmp_rv_values, *dist_params, **kwargs)
 
     transform = getattr(rv_value_var.tag, "transform", None) if rv_value_var else None
 
     # Replace random variables with their value variables
-    replacements = rv_values.copy()
-    replacements.update({rv_var: rv_value, rv_value_var: rv_value})
+    replacements = ChainMap({rv_var: rv_value, rv_value_var: rv_value}, rv_values)
 
     (logp_var,), _ = rvs_to_value_vars(
         (logp_var,),
@@ -340,15 +624,13 @@ def logcdfpt(
         logp_var = at.sum(logp_var)
 
     if scaling:
-        logp_var *= _get_scaling(
-            getattr(rv_var.tag, "total_size", None), rv_value.shape, rv_value.ndim
-        )
+        coef = _get_value_scaling(getattr(rv_var.tag, "total_size", None), rv_value)
+        if not _is_scaling_one(coef):
+            logp_var *= coef
 
     # Recompute test values for the changes introduced by the replacements
     # above.
-    if config.compute_test_value != "off":
-        for node in io_toposort(graph_inputs((logp_var,)), (logp_var,)):
-            compute_test_value(node)
+    _recompute_test_values(logp_var)
 
     if rv_var.name is not None:
         logp_var.name = f"__logp_{rv_var.name}"
@@ -356,35 +638,30 @@ def logcdfpt(
     return logp_var
 
 
-def logp(var, rv_values, **kwargs):
-    """Create a log-probability graph."""
+def _ensure_value_var(var, rv_values):
+    """Attach the value_var to the tag of var when it does not have one."""
+    if hasattr(var.tag, "value_var"):
+        return
+    if isinstance(rv_values, Mapping):
+        value_var = rv_values[var]
+    else:
+        value_var = rv_values
+    var.tag.value_var = at.as_tensor_variable(value_var, dtype=var.dtype)
 
-    # Attach the value_var to the tag of var when it does not have one
-    if not hasattr(var.tag, "value_var"):
-        if isinstance(rv_values, Mapping):
-            value_var = rv_values[var]
-        else:
-            value_var = rv_values
-        var.tag.value_var = at.as_tensor_variable(value_var, dtype=var.dtype)
 
+def logp(var, rv_values, **kwargs):
+    """Create a log-probability graph."""
+    _ensure_value_var(var, rv_values)
     return logpt(var, rv_values, **kwargs)
 
 
 def logcdf(var, rv_values, **kwargs):
     """Create a log-CDF graph."""
-
-    # Attach the value_var to the tag of var when it does not have one
-    if not hasattr(var.tag, "value_var"):
-        if isinstance(rv_values, Mapping):
-            value_var = rv_values[var]
-        else:
-            value_var = rv_values
-        var.tag.value_var = at.as_tensor_variable(value_var, dtype=var.dtype)
-
+    _ensure_value_var(var, rv_values)
     return logcdfpt(var, rv_values, **kwargs)
 
 
-@singledispatch
+@_singledispatch_exact
 def _logcdf(op, values, *args, **kwargs):
     """Create a log-CDF graph.
 
@@ -403,3 +680,136 @@ def logpt_sum(*args, **kwargs):
     if only the sum of the logp values is needed.
     """
     return logpt(*args, sum=True, **kwargs)
+
+
+# Functions compiled by `logpt_compiled`.  Unlike the graphs in `_graph_cache`,
+# nothing else usually holds on to them, so they are kept in a cache of bounded size.
+_compiled_logpt_cache = LRUCache(maxsize=32)
+
+
+def _get_rv_value(var, rv_values):
+    """Return the value of `var` that `logpt` uses for the given `rv_values`, if any."""
+    if isinstance(rv_values, Mapping):
+        return rv_values.get(var)
+    elif rv_values is not None:
+        return rv_values
+    return _get_tagged_value_var(var)
+
+
+def logpt_compiled(
+    var: TensorVariable,
+    rv_values: Optional[Union[TensorVariable, Dict[TensorVariable, TensorVariable]]] = None,
+    *,
+    inputs: Optional[Sequence[TensorVariable]] = None,
+    mode: Optional[Union[str, Mode]] = None,
+    **kwargs,
+) -> Function:
+    """Compile the log-likelihood graph of a random variable.
+
+    The compiled functions are cached, so that repeated calls with the same
+    arguments don't compile the same graph again.
+
+    Parameters
+    ==========
+    var
+        The `RandomVariable` output that determines the log-likelihood graph.
+    rv_values
+        A variable, or ``dict`` of variables, that represents the value of
+        `var` in its log-likelihood. See `logpt`.  The value of `var` must
+        be symbolic.
+    inputs
+        The inputs of the compiled function.  They must include all the
+        non-constant inputs of the log-likelihood graph.  Defaults to the
+        value of `var`.
+    mode
+        The Aesara compilation mode, e.g. ``"NUMBA"`` or ``"JAX"``. Defaults
+        to ``aesara.config.mode``.
+    **kwargs
+        Passed to `logpt`.
+
+    Returns
+    =======
+    An Aesara function of `inputs`.
+    """
+    rv_value = _get_rv_value(var, rv_values)
+    if not isinstance(rv_value, TensorVariable):
+        raise TypeError(f"Expected a symbolic value for {var}, got {rv_value}")
+    inputs = [rv_value] if inputs is None else list(inputs)
+
+    key = _graph_cache_key(
+        logpt_compiled,
+        var,
+        rv_values,
+        inputs=tuple(_ref(i) for i in inputs),
+        mode=config.mode if mode is None else mode,
+        **kwargs,
+    )
+    fn = None if key is None else _compiled_logpt_cache.get(key)
+    if fn is None:
+        logp_var = logpt(var, rv_values, **kwargs)
+        if logp_var is None:
+            raise ValueError(f"No log-likelihood graph could be built for {var} and {rv_values}")
+        missing_inputs = [i for i in inputvars(logp_var) if i not in inputs]
+        if missing_inputs:
+            raise ValueError(
+                f"The log-likelihood graph of {var} also depends on {missing_inputs}, "
+                "which must be included in `inputs`"
+            )
+        fn = aesara.function(inputs, logp_var, mode=mode)
+        if key is not None:
+            _compiled_logpt_cache[key] = fn
+    return fn
+
+
+def logpt_specialized(
+    var: TensorVariable,
+    value_shape: Sequence[int],
+    rv_values: Optional[Union[TensorVariable, Dict[TensorVariable, TensorVariable]]] = None,
+    **kwargs,
+) -> TensorVariable:
+    """Create a log-likelihood graph for a value of a fixed shape.
+
+    The shape of the value variable is replaced by `value_shape` in the graph
+    built by `logpt`, which is then rewritten so that Aesara can specialize it
+    to that shape.  The resulting graph only accepts values of that shape.
+    The graphs are cached like those of `logpt`.
+
+    Parameters
+    ==========
+    var
+        The `RandomVariable` output that determines the log-likelihood graph.
+    value_shape
+        The shape of the value of `var`.
+    rv_values
+        A variable, or ``dict`` of variables, that represents the value of
+        `var` in its log-likelihood. See `logpt`.  The value of `var` must
+        be symbolic.
+    **kwargs
+        Passed to `logpt`.
+
+    """
+    rv_value = _get_rv_value(var, rv_values)
+    if not isinstance(rv_value, TensorVariable):
+        raise TypeError(f"Expected a symbolic value for {var}, got {rv_value}")
+
+    value_shape = tuple(int(s) for s in value_shape)
+    if len(value_shape) != rv_value.ndim:
+        raise ValueError(
+            f"Expected a shape of length {rv_value.ndim} for {rv_value}, got {value_shape}"
+        )
+
+    return _cached_graph(
+        _build_logpt_specialized, var, rv_values, value_shape=value_shape, **kwargs
+    )
+
+
+def _build_logpt_specialized(var, rv_values, *, value_shape, **kwargs):
+    logp_var = logpt(var, rv_values, **kwargs)
+    if logp_var is None:
+        raise ValueError(f"No log-likelihood graph could be built for {var} and {rv_values}")
+
+    rv_value = _get_rv_value(var, rv_values)
+    specialized_logp = clone_replace(
+        logp_var, replace={rv_value: at.specify_shape(rv_value, value_shape)}
+    )
+    return optimize_graph(specialized_logp, include=["canonicalize", "specialize"])
@@ -11,6 +11,9 @@
 #   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
+import gc
+import weakref
+
 import aesara
 import aesara.tensor as at
 import numpy as np
@@ -31,11 +34,31 @@ from aesara.tensor.subtensor import (
 from pymc.aesaraf import floatX, walk_model
 from pymc.distributions.continuous import Normal, Uniform
 from pymc.distributions.discrete import Bernoulli
-from pymc.distributions.logprob import logcdf, logp, logpt
+from pymc.distributions.logprob import (
+    _as_value_of,
+    _compiled_logpt_cache,
+    _graph_cache,
+    _singledispatch_exact,
+    _walk_ancestors,
+    logcdf,
+    logp,
+    logpt,
+    logpt_compiled,
+    logpt_specialized,
+)
 from pymc.model import Model
 from pymc.tests.helpers import select_by_precision
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_graph_cache():
+    _graph_cache.clear()
+    _compiled_logpt_cache.clear()
+    yield
+    _graph_cache.clear()
+    _compiled_logpt_cache.clear()
+
+
 def assert_no_rvs(var):
     assert not any(isinstance(v.owner.op, RandomVariable) for v in ancestors([var]) if v.owner)
     return var
@@ -201,3 +224,257 @@ def test_model_unchanged_logprob_access_():
     model.logpt
     new_inputs = set(aesara.graph.graph_inputs([c]))
     assert original_inputs == new_inputs
+
+
+def test_logpt_graph_cache():
+    x = Normal.dist(0, 1, size=2)
+    value = at.vector("value")
+
+    x_logp = logpt(x, value)
+    assert logpt(x, value) is x_logp
+    assert logpt(x, {x: value}) is not x_logp
+    assert logpt(x, value, sum=False) is not x_logp
+    assert logpt(x, at.vector("value")) is not x_logp
+
+    x.tag.total_size = 10
+    assert logpt(x, value) is not x_logp
+
+    x_logcdf = logcdf(x, value)
+    assert logcdf(x, value) is x_logcdf
+
+
+def test_logpt_graph_cache():
+    x = Normal.dist(0, 1, size=2)
+    value = at.vector("value")
+
+    x_logp = logpt(x, value)
+    assert logpt(x, value) is x_logp
+    assert logpt(x, {x: value}) is not x_logp
+    assert logpt(x, value, sum=False) is not x_logp
+    assert logpt(x, at.vector("value")) is not x_logp
+
+    x.tag.total_size = 10
+    assert logpt(x, value) is not x_logp
+
+    x_logcdf = logcdf(x, value)
+    assert logcdf(x, value) is x_logcdf
+
+
+def test_logpt_graph_cache_weak_references():
+    x = Normal.dist(0, 1, size=2)
+    value = at.vector("value")
+
+    # Entries only live as long as their graphs
+    x_logp_ref = weakref.ref(logpt(x, value))
+    gc.collect()
+    assert x_logp_ref() is None
+    assert len(_graph_cache) == 0
+
+    # And the cache doesn't keep the variables alive
+    x_logp = logpt(x, value)
+    x_ref = weakref.ref(x)
+    del x
+    gc.collect()
+    assert x_ref() is None
+    assert x_logp.owner is not None
+
+
+def test_logpt_graph_cache_ancestor_tags():
+    x = Normal.dist(0, 1)
+    y = Normal.dist(x, 1)
+    x_value = x.type()
+    y_value = y.type()
+
+    y_logp = logpt(y, y_value)
+    assert x_value not in ancestors([y_logp])
+
+    # Tagging a value variable on an ancestor changes the logp graph
+    logp(x, x_value)
+    y_logp = logpt(y, y_value)
+    assert x_value in ancestors([y_logp])
+    assert_no_rvs(y_logp)
+
+
+def test_logpt_graph_cache_config():
+    x = Normal.dist(0, 1, size=2)
+    value = at.vector("value")
+
+    x_logp = logpt(x, value)
+    other_floatX = "float32" if aesara.config.floatX == "float64" else "float64"
+    with aesara.config.change_flags(floatX=other_floatX):
+        assert logpt(x, value) is not x_logp
+
+    # Graphs with test values are rebuilt for the current test values
+    with aesara.config.change_flags(compute_test_value="raise"):
+        x = Normal.dist(0, 1, size=2)
+        value.tag.test_value = floatX(np.array([0, 1]))
+        x_logp_test_value = logpt(x, value)
+        assert np.isclose(x_logp_test_value.tag.test_value, sp.norm.logpdf([0, 1]).sum())
+
+        value.tag.test_value = floatX(np.array([1, 2]))
+        x_logp_test_value = logpt(x, value)
+        assert np.isclose(x_logp_test_value.tag.test_value, sp.norm.logpdf([1, 2]).sum())
+
+
+def test_walk_ancestors():
+    x = at.vector("x")
+    y = at.exp(x)
+    z = y + y * x
+
+    res = list(_walk_ancestors([z]))
+    assert len(res) == len({id(v) for v in res})
+    assert {id(v) for v in res} == {id(v) for v in ancestors([z])}
+
+    # Every variable comes after its inputs
+    position = {id(v): i for i, v in enumerate(res)}
+    for v in res:
+        if v.owner:
+            assert all(position[id(inp)] < position[id(v)] for inp in v.owner.inputs)
+
+
+@pytest.mark.parametrize("sum", [True, False])
+def test_logpt_single_var(sum):
+    with Model() as m:
+        a = Uniform("a", 0.0, 1.0, total_size=10)
+
+    a_value_var = m.rvs_to_values[a]
+    a_logp = logpt(a, a_value_var, sum=sum)
+
+    # The scaled log-Jacobian of the interval transform of a standard uniform
+    point = {a_value_var: np.array(0.3, dtype=a_value_var.dtype)}
+    sigmoid = 1 / (1 + np.exp(-0.3))
+    np.testing.assert_allclose(a_logp.eval(point), 10 * np.log(sigmoid * (1 - sigmoid)), rtol=1e-6)
+
+
+def test_logpt_single_var_tagged_ancestors():
+    with Model() as m:
+        mu = Normal("mu")
+        x = Normal("x", mu)
+
+    mu_value_var = m.rvs_to_values[mu]
+    x_value_var = m.rvs_to_values[x]
+
+    x_logp = logpt(x, x_value_var)
+
+    assert_no_rvs(x_logp)
+    assert mu_value_var in ancestors([x_logp])
+    point = {mu_value_var: floatX(0.5), x_value_var: floatX(1.0)}
+    np.testing.assert_allclose(x_logp.eval(point), sp.norm(0.5, 1).logpdf(1.0), rtol=1e-6)
+
+
+def test_logpt_compiled():
+    value = at.vector("value")
+    x = Normal.dist(0, 1, size=2)
+
+    x_logp_fn = logpt_compiled(x, value, sum=False)
+    assert logpt_compiled(x, value, sum=False) is x_logp_fn
+    assert logpt_compiled(x, value) is not x_logp_fn
+    np.testing.assert_almost_equal(
+        x_logp_fn(floatX(np.array([0, 1]))), sp.norm(0, 1).logpdf([0, 1]), decimal=5
+    )
+
+    with pytest.raises(TypeError, match="Expected a symbolic value"):
+        logpt_compiled(x, floatX(np.array([0, 1])))
+
+    # The values of the ancestors must be inputs too
+    mu = Normal.dist(0, 1)
+    y = Normal.dist(mu, 1)
+    mu_value = mu.type()
+    y_value = y.type()
+    logp(mu, mu_value)
+    with pytest.raises(ValueError, match="must be included in `inputs`"):
+        logpt_compiled(y, y_value)
+    y_logp_fn = logpt_compiled(y, y_value, inputs=[y_value, mu_value])
+    np.testing.assert_almost_equal(
+        y_logp_fn(floatX(1.0), floatX(0.5)), sp.norm(0.5, 1).logpdf(1.0), decimal=5
+    )
+
+    with pytest.raises(ValueError, match="No log-likelihood graph"):
+        logpt_compiled(at.exp(x) * at.ones(2), value)
+
+
+def test_logpt_joint_then_single_var():
+    with Model() as m:
+        mu = Normal("mu")
+        x = Normal("x", mu)
+
+    mu_value_var = m.rvs_to_values[mu]
+    x_value_var = m.rvs_to_values[x]
+
+    # `mu` is requested in the joint call, and an extra rv-value pair in the single one
+    logpt([mu, x], {mu: mu_value_var, x: x_value_var})
+    x_logp = logpt(x, {x: x_value_var})
+    assert_no_rvs(x_logp)
+    assert mu_value_var in ancestors([x_logp])
+
+    m.logpt
+    for _ in range(3):
+        x_point_logp = m.point_logps({"mu": 0.5, "x": 1.0}, round_vals=6)["x"]
+        np.testing.assert_allclose(x_point_logp, sp.norm(0.5, 1).logpdf(1.0), rtol=1e-5)
+
+
+def test_logpt_specialized():
+    value = at.vector("value")
+    x = Normal.dist(0, 1, size=3)
+
+    x_logp = logpt_specialized(x, (3,), value)
+    assert logpt_specialized(x, (3,), value) is x_logp
+    assert logpt_specialized(x, (3,), value, sum=False) is not x_logp
+    assert logpt_specialized(x, (4,), value) is not x_logp
+
+    test_value = floatX(np.array([0, 1, 2]))
+    np.testing.assert_almost_equal(
+        x_logp.eval({value: test_value}), sp.norm(0, 1).logpdf(test_value).sum(), decimal=5
+    )
+
+    with pytest.raises(ValueError, match="Expected a shape of length 1"):
+        logpt_specialized(x, (3, 1), value)
+
+    with pytest.raises(TypeError, match="Expected a symbolic value"):
+        logpt_specialized(x, (3,), test_value)
+
+    # There is no log-likelihood for this deterministic transformation of `x`
+    y = at.exp(x) * at.ones(3)
+    with pytest.raises(ValueError, match="No log-likelihood graph"):
+        logpt_specialized(y, (3,), {y: value})
+
+
+def test_logpt_test_value():
+    value = at.vector("value")
+    value.tag.test_value = floatX(np.array([0, 1]))
+
+    with aesara.config.change_flags(compute_test_value="raise"):
+        x = Normal.dist(0, 1, size=2)
+        x_logp = logpt(x, value, sum=False)
+        x_logcdf = logcdf(x, value, sum=False)
+
+    np.testing.assert_almost_equal(x_logp.tag.test_value, sp.norm(0, 1).logpdf([0, 1]), decimal=5)
+    np.testing.assert_almost_equal(x_logcdf.tag.test_value, sp.norm(0, 1).logcdf([0, 1]), decimal=5)
+
+
+def test_as_value_of():
+    x = Normal.dist(0, 1, size=2)
+
+    value = x.type()
+    assert _as_value_of(x, value) is value
+
+    value = at.ivector("value")
+    assert _as_value_of(x, value).type == x.type
+    assert _as_value_of(x, [0, 1]).type == x.type
+
+
+def test_singledispatch_exact():
+    @_singledispatch_exact
+    def f(x):
+        return "default"
+
+    @f.register(int)
+    def _(x):
+        return "int"
+
+    assert f(1) == "int"
+    assert f(True) == "int"
+    assert f(1.0) == "default"
+
+    f.register(bool, lambda x: "bool")
+    assert f(True) == "bool"
@@ -12,7 +12,9 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import gc
 import itertools
+import weakref
 
 import aesara
 import cloudpickle
@@ -20,12 +22,19 @@ import numpy as np
 import pytest
 
 from aesara import tensor as at
+from aesara.graph.basic import ancestors
 from scipy import stats as stats
 
 import pymc as pm
 
 from pymc import GeneratorAdapter, Normal, at_rng, floatX, generator
 from pymc.aesaraf import GeneratorOp
+from pymc.distributions.logprob import (
+    _get_scaling,
+    _get_value_scaling,
+    _is_scaling_one,
+    _scaling_cache,
+)
 from pymc.tests.helpers import select_by_precision
 
 
@@ -254,6 +263,46 @@ class TestScaling:
             and np.allclose(_p0, p5())
         )
 
+    def test_get_scaling_skips_unscaled_dims(self):
+        shape = at.as_tensor(np.array([2, 3, 4, 5]))
+        coef = _get_scaling([10, None, Ellipsis, None, 20], shape, 4)
+        np.testing.assert_allclose(coef.eval(), 10 / 2 * 20 / 5)
+        coef = _get_scaling([None, 6, Ellipsis], shape, 4)
+        np.testing.assert_allclose(coef.eval(), 6 / 3)
+        coef = _get_scaling([None, Ellipsis, None], shape, 4)
+        np.testing.assert_allclose(coef.eval(), 1)
+
+    def test_get_value_scaling_reused(self):
+        value = at.matrix("value")
+        coef = _get_value_scaling([10, Ellipsis, 20], value)
+        assert _get_value_scaling([10, Ellipsis, 20], value) is coef
+        assert _get_value_scaling((10, Ellipsis, 20), value) is coef
+        assert _get_value_scaling([10, Ellipsis, 30], value) is not coef
+        assert _get_value_scaling([10, Ellipsis, 20], at.matrix("value")) is not coef
+
+        other_floatX = "float32" if aesara.config.floatX == "float64" else "float64"
+        with aesara.config.change_flags(floatX=other_floatX):
+            other_coef = _get_value_scaling([10, Ellipsis, 20], value)
+        assert other_coef is not coef
+        assert other_coef.dtype == other_floatX
+
+        # The cache doesn't keep the value variables or their scalings alive
+        value_ref = weakref.ref(value)
+        del value, coef, other_coef
+        gc.collect()
+        assert value_ref() is None
+        assert not any(key[0] is value_ref for key in _scaling_cache.keys())
+
+    def test_unscaled_logp_has_no_scaling(self):
+        assert _is_scaling_one(_get_scaling(None, None, 1))
+        assert _is_scaling_one(_get_scaling([], None, 1))
+        assert _is_scaling_one(_get_scaling([None, Ellipsis], at.as_tensor([2, 3]), 2))
+        assert not _is_scaling_one(_get_scaling([2, Ellipsis], at.as_tensor([2, 3]), 2))
+
+        with pm.Model() as m:
+            Normal("n", observed=[1.0, 2.0])
+        assert _get_scaling(None, None, 1) not in ancestors([m.observedlogpt])
+
     def test_common_errors(self):
         with pytest.raises(ValueError) as e:
             with pm.Model() as m: